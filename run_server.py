@@ -3,12 +3,23 @@ Run the FastAPI server for the agentic template.
 
 Usage:
     python run_server.py
+
+Transport options are read from ``SERVER_*`` environment variables
+(see ``src/server/settings.py``). Set ``SERVER_HTTP2=1`` to serve with
+Hypercorn, which supports HTTP/2, instead of uvicorn.
 """
 
+import os
 import subprocess
 import sys
 from pathlib import Path
 
+# Import the server package the same way the app does
+SRC_DIR = Path(__file__).parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from server.settings import ServerSettings  # noqa: E402
+
 
 def main():
     """Run the FastAPI server."""
@@ -20,21 +31,36 @@ def main():
         print(f"Error: Server file not found at {server_path}")
         sys.exit(1)
     
+    settings = ServerSettings.from_env()
+
+    if settings.http2:
+        # Hypercorn speaks HTTP/2 (h2c); uvicorn only supports HTTP/1.1
+        command = [
+            sys.executable, "-m", "hypercorn",
+            "server.main:app",
+            *settings.hypercorn_args(),
+            "--reload"
+        ]
+    else:
+        command = [
+            sys.executable, "-m", "uvicorn",
+            "server.main:app",
+            *settings.uvicorn_args(),
+            "--reload"
+        ]
+
     print("Starting FastAPI server...")
-    print("API will be available at: http://localhost:8000")
-    print("API docs will be available at: http://localhost:8000/docs")
+    print(f"API will be available at: http://localhost:{settings.port}")
+    print(f"API docs will be available at: http://localhost:{settings.port}/docs")
     print("Press CTRL+C to stop the server")
     print("-" * 50)
     
     try:
         # Run the server using uv
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "src.server.main:app", 
-            "--host", "0.0.0.0", 
-            "--port", "8000", 
-            "--reload"
-        ], check=True)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+        subprocess.run(command, check=True, env=env)
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except subprocess.CalledProcessError as e:
@@ -1,5 +1,5 @@
 """Agentic Template - A simple LangGraph agent."""
 
-from .agent import create_agent, AgentState
+from .agent import create_agent, build_workflow, clear_agent_cache, AgentState
 
-__all__ = ["create_agent", "AgentState"]
+__all__ = ["create_agent", "build_workflow", "clear_agent_cache", "AgentState"]
@@ -1,6 +1,9 @@
 """Simple LangGraph agent implementation."""
 
-from typing import TypedDict, Annotated
+from functools import lru_cache
+import threading
+import weakref
+from typing import TypedDict, Annotated, Optional, Sequence, Union
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 
@@ -43,11 +46,11 @@ def should_continue(state: AgentState) -> str:
     return "continue"
 
 
-def create_agent():
-    """Create and compile a simple LangGraph agent.
+def build_workflow() -> StateGraph:
+    """Build and validate the agent graph structure without compiling it.
 
     Returns:
-        A compiled LangGraph agent that processes messages and maintains a counter.
+        A validated StateGraph with the agent's nodes and edges.
     """
     workflow = StateGraph(AgentState)
 
@@ -65,6 +68,96 @@ def create_agent():
         }
     )
 
-    # Compile the graph
-    app = workflow.compile()
-    return app
+    # Fail at build time rather than on first invocation
+    workflow.validate()
+    return workflow
+
+
+# The graph structure is fixed, so it is built once at import time
+WORKFLOW = build_workflow()
+
+
+def _freeze(nodes):
+    """Make an interrupt node list hashable; "*" (all nodes) is kept as is."""
+    if not nodes:
+        return None
+    if nodes == "*":
+        return nodes
+    if isinstance(nodes, str):
+        return (nodes,)
+    return tuple(nodes)
+
+
+def _thaw(nodes):
+    """Turn a frozen interrupt node list back into what compile() expects."""
+    return list(nodes) if isinstance(nodes, tuple) else nodes
+
+
+def _compile(checkpointer, interrupt_before, interrupt_after, debug):
+    """Compile the shared workflow for one configuration."""
+    return WORKFLOW.compile(
+        checkpointer=checkpointer,
+        interrupt_before=_thaw(interrupt_before),
+        interrupt_after=_thaw(interrupt_after),
+        debug=debug
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_agent(interrupt_before, interrupt_after, debug):
+    """Compile and cache a graph that has no checkpointer."""
+    return _compile(None, interrupt_before, interrupt_after, debug)
+
+
+# Graphs with a checkpointer are held weakly, so a tenant's checkpointer and
+# graph are freed once callers drop the graph. Keying on id() is safe because
+# the graph references its checkpointer, keeping the id in use while cached.
+_checkpointed_agents: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_checkpointed_lock = threading.Lock()
+
+
+def create_agent(
+    checkpointer=None,
+    *,
+    interrupt_before: Optional[Union[str, Sequence[str]]] = None,
+    interrupt_after: Optional[Union[str, Sequence[str]]] = None,
+    debug: bool = False
+):
+    """Create and compile a simple LangGraph agent.
+
+    Compiled graphs are cached per configuration, so repeated calls with the
+    same options return the same instance. Graphs with a checkpointer stay
+    cached only while a caller still holds them. Compiled graphs hold no
+    per-run state and are safe to share across threads.
+
+    Args:
+        checkpointer: Optional checkpointer for persisting graph state.
+        interrupt_before: Node name(s) to interrupt before, or "*" for all.
+        interrupt_after: Node name(s) to interrupt after, or "*" for all.
+        debug: Whether to compile the graph in debug mode.
+
+    Returns:
+        A compiled LangGraph agent that processes messages and maintains a counter.
+    """
+    options = (_freeze(interrupt_before), _freeze(interrupt_after), debug)
+    if checkpointer is None:
+        return _compile_agent(*options)
+
+    key = (id(checkpointer),) + options
+    with _checkpointed_lock:
+        agent = _checkpointed_agents.get(key)
+        if agent is None:
+            agent = _compile(checkpointer, *options)
+            _checkpointed_agents[key] = agent
+        return agent
+
+
+def clear_agent_cache() -> None:
+    """Drop all cached compiled agents."""
+    _compile_agent.cache_clear()
+    with _checkpointed_lock:
+        _checkpointed_agents.clear()
+
+
+# Default compiled graph, shared by the server and the LangGraph CLI
+graph = create_agent()
@@ -0,0 +1,210 @@
+"""Adaptive concurrency limiting for agent graph execution."""
+
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
+import math
+import threading
+import time
+
+
+class LimitExceeded(Exception):
+    """Raised when a request arrives while the in-flight limit is reached."""
+
+
+class _Waiter:
+    """A request waiting for a slot; ``granted`` is set under the lock."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _wake(future: asyncio.Future) -> None:
+    """Resolve a waiter's future unless it already timed out."""
+    if not future.done():
+        future.set_result(None)
+
+
+class GradientLimiter:
+    """Adjust the in-flight limit from observed latency.
+
+    A gradient limiter in the style of Netflix's concurrency-limits
+    (Gradient2). A slow exponential average of latency tracks the no-load
+    baseline; each completed run compares its latency against that baseline.
+    While latency stays near the baseline the limit grows by a small queue
+    allowance, and as latency inflates the limit shrinks proportionally.
+    Requests over the limit may wait briefly in a small FIFO queue for a
+    slot (see ``acquire_async``); beyond that they are rejected, so the
+    server sheds load instead of inflating tail latency.
+
+    Args:
+        initial_limit: Starting in-flight limit, clamped to the bounds.
+        min_limit: Lowest the limit may drop to.
+        max_limit: Highest the limit may grow to.
+        smoothing: Weight given to each new limit estimate (0-1).
+        tolerance: Latency inflation over the baseline tolerated before
+            the limit is reduced.
+        long_window: Number of samples in the baseline latency average.
+        max_waiting: Requests allowed to wait for a slot at once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 4,
+        max_limit: int = 200,
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        long_window: int = 600,
+        max_waiting: int = 0
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.max_waiting = max_waiting
+        self._decay = 2.0 / (long_window + 1)
+        self._limit = float(max(min_limit, min(max_limit, initial_limit)))
+        self._long_latency = 0.0
+        self._in_flight = 0
+        self._rejected = 0
+        self._waiters: "deque[_Waiter]" = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of runs currently executing."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def rejected(self) -> int:
+        """Total number of requests rejected for exceeding the limit."""
+        return self._rejected
+
+    def try_acquire(self) -> bool:
+        """Reserve a slot if one is free."""
+        with self._lock:
+            if self._waiters or self._in_flight >= int(self._limit):
+                self._rejected += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        """Free a slot and feed the run's latency (in seconds) back in."""
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            self._update(latency, in_flight)
+            self._grant_waiters()
+
+    def _grant_waiters(self) -> None:
+        """Hand free slots to waiting requests, oldest first."""
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            except RuntimeError:
+                # The waiter's event loop is gone
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+
+    def _update(self, latency: float, in_flight: int) -> None:
+        """Recompute the limit from one latency sample."""
+        if latency <= 0:
+            return
+
+        if self._long_latency == 0.0:
+            self._long_latency = latency
+        else:
+            self._long_latency += self._decay * (latency - self._long_latency)
+
+        # Pull the baseline down quickly once load drops, so a past spike
+        # does not keep the limit inflated
+        if self._long_latency / latency > 2:
+            self._long_latency *= 0.95
+
+        # Don't grow the limit when traffic is not using it
+        if in_flight < self._limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_latency / latency))
+        estimate = self._limit * gradient + math.sqrt(self._limit)
+        limit = self._limit * (1 - self.smoothing) + estimate * self.smoothing
+        self._limit = max(self.min_limit, min(self.max_limit, limit))
+
+    @contextmanager
+    def acquire(self):
+        """Run a block under the limit, timing it for the next adjustment.
+
+        Raises:
+            LimitExceeded: If the in-flight limit is already reached.
+        """
+        if not self.try_acquire():
+            raise LimitExceeded(f"Concurrency limit of {self.limit} reached")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def acquire_async(self, timeout: float = 0.0):
+        """Like ``acquire``, but wait up to ``timeout`` seconds for a slot.
+
+        At most ``max_waiting`` requests wait at once; the rest are
+        rejected immediately.
+
+        Raises:
+            LimitExceeded: If no slot frees up in time or the queue is full.
+        """
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                waiter = None
+            elif timeout <= 0 or len(self._waiters) >= self.max_waiting:
+                self._rejected += 1
+                raise LimitExceeded(f"Concurrency limit of {self.limit} reached")
+            else:
+                waiter = _Waiter(asyncio.get_running_loop())
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    # A slot may have been handed over just as we timed out
+                    if not waiter.granted:
+                        self._waiters.remove(waiter)
+                        self._rejected += 1
+                        raise LimitExceeded(
+                            f"Concurrency limit of {self.limit} reached")
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter.granted:
+                        # Give the slot to the next waiter, if any
+                        self._in_flight -= 1
+                        self._grant_waiters()
+                    else:
+                        self._waiters.remove(waiter)
+                raise
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
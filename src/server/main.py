@@ -1,7 +1,12 @@
 """FastAPI server for interacting with the LangGraph agent."""
 
 from agentic_template.agent import create_agent, AgentState
+from anyio import to_thread
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import sys
@@ -9,6 +14,10 @@ import os
 import time
 import uuid
 
+from server.concurrency import GradientLimiter, LimitExceeded
+from server.recorder import RequestRecorder
+from server.settings import ServerSettings
+
 # Add src to Python path to import agent
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.dirname(current_dir)
@@ -59,18 +68,74 @@ class OpenAIModelsResponse(BaseModel):
     data: List[Dict[str, Any]]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the thread pool for agent runs; close the recorder on shutdown."""
+    # Agent runs use anyio's default thread pool (40 threads). Make room for
+    # the largest concurrency limit, or admitted runs would queue for a thread
+    thread_limiter = to_thread.current_default_thread_limiter()
+    thread_limiter.total_tokens = max(
+        thread_limiter.total_tokens, settings.concurrency_max)
+    yield
+    if recorder:
+        recorder.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Agentic Template API",
     version="0.1.0",
     description="OpenAI-compatible API for LangGraph Agent",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Transport settings (compression, keep-alive, backlog, HTTP/2)
+settings = ServerSettings.from_env()
+
+# Compress large non-streaming bodies; event streams are never compressed
+if settings.gzip_min_size > 0:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.gzip_min_size,
+        compresslevel=settings.gzip_level
+    )
+
 # Initialize the agent
 agent = create_agent()
 
+# Adapt the number of concurrent agent runs to observed latency
+limiter = GradientLimiter(
+    initial_limit=settings.concurrency_initial,
+    min_limit=settings.concurrency_min,
+    max_limit=settings.concurrency_max,
+    max_waiting=settings.concurrency_queue_size
+)
+
+# Optionally record sampled traffic for replay with server.replay
+recorder = None
+if settings.record_path:
+    recorder = RequestRecorder(
+        settings.record_path,
+        sample_rate=settings.record_sample_rate,
+        redact=settings.record_redact
+    )
+
+
+async def run_agent(state: AgentState) -> AgentState:
+    """Run the agent off the event loop under the concurrency limit.
+
+    Raises:
+        HTTPException: 503 if no slot frees up within the queue timeout.
+    """
+    try:
+        async with limiter.acquire_async(settings.concurrency_queue_timeout):
+            return await run_in_threadpool(agent.invoke, state)
+    except LimitExceeded as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
 
 @app.get("/")
 async def root():
@@ -89,6 +154,7 @@ async def chat(message: ChatMessage) -> ChatResponse:
     Returns:
         The agent's response and current counter value
     """
+    started = time.time()
     try:
         # Create initial state with the message
         initial_state: AgentState = {
@@ -97,7 +163,7 @@ async def chat(message: ChatMessage) -> ChatResponse:
         }
 
         # Run the agent
-        result = agent.invoke(initial_state)
+        result = await run_agent(initial_state)
 
         # Extract response from messages
         response_messages = result.get("messages", [])
@@ -112,8 +178,14 @@ async def chat(message: ChatMessage) -> ChatResponse:
             response_text = "No response"
         counter = result.get("counter", 0)
 
-        return ChatResponse(response=response_text, counter=counter)
+        response = ChatResponse(response=response_text, counter=counter)
+        if recorder:
+            recorder.record(
+                "/chat", message.model_dump(), response.model_dump(), started)
+        return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error processing message: {str(e)}")
@@ -122,7 +194,30 @@ async def chat(message: ChatMessage) -> ChatResponse:
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "agent": "ready"}
+    return {
+        "status": "healthy",
+        "agent": "ready",
+        "concurrency": {
+            "limit": limiter.limit,
+            "in_flight": limiter.in_flight,
+            "waiting": limiter.waiting
+        }
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    """Concurrency metrics in Prometheus text format."""
+    return (
+        "# TYPE agent_concurrency_limit gauge\n"
+        f"agent_concurrency_limit {limiter.limit}\n"
+        "# TYPE agent_in_flight gauge\n"
+        f"agent_in_flight {limiter.in_flight}\n"
+        "# TYPE agent_waiting gauge\n"
+        f"agent_waiting {limiter.waiting}\n"
+        "# TYPE agent_rejected_total counter\n"
+        f"agent_rejected_total {limiter.rejected}\n"
+    )
 
 
 @app.get("/v1")
@@ -162,6 +257,8 @@ async def chat_completions(request: OpenAIChatRequest) -> OpenAIChatResponse:
 
     This allows OpenWebUI to communicate with our agent using the standard OpenAI API format.
     """
+    started = time.time()
+
     # Extract the last user message
     user_messages = [msg for msg in request.messages if msg.role == "user"]
     if not user_messages:
@@ -178,7 +275,7 @@ async def chat_completions(request: OpenAIChatRequest) -> OpenAIChatResponse:
         }
 
         # Run the agent
-        result = agent.invoke(initial_state)
+        result = await run_agent(initial_state)
 
         # Extract response from messages
         response_messages = result.get("messages", [])
@@ -195,7 +292,7 @@ async def chat_completions(request: OpenAIChatRequest) -> OpenAIChatResponse:
         # Create OpenAI-compatible response
         completion_id = f"chatcmpl-{uuid.uuid4().hex[:28]}"
 
-        return OpenAIChatResponse(
+        response = OpenAIChatResponse(
             id=completion_id,
             created=int(time.time()),
             model=request.model,
@@ -215,12 +312,27 @@ async def chat_completions(request: OpenAIChatRequest) -> OpenAIChatResponse:
                 "total_tokens": len(last_user_message.split()) + len(response_text.split())
             }
         )
-
+        if recorder:
+            recorder.record(
+                "/v1/chat/completions",
+                request.model_dump(),
+                response.model_dump(),
+                started
+            )
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error processing chat completion: {str(e)}")
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if settings.http2:
+        import asyncio
+        from hypercorn.asyncio import serve
+        asyncio.run(serve(app, settings.hypercorn_config()))
+    else:
+        import uvicorn
+        uvicorn.run(app, **settings.uvicorn_kwargs())
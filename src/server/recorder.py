@@ -0,0 +1,124 @@
+"""Sampled request/response recording for replay and profiling."""
+
+from typing import Any, Dict, Optional
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Fields holding user or agent text, masked when redaction is on
+REDACTED_FIELDS = {"content", "message", "response"}
+
+
+def redact(value: Any, key: Optional[str] = None) -> Any:
+    """Mask user text while keeping its length and word count.
+
+    Every non-whitespace character in a redacted field becomes ``x`` and all
+    whitespace is kept, so replayed payloads keep their original size and
+    token counts.
+    """
+    if isinstance(value, dict):
+        return {k: redact(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v, key) for v in value]
+    if isinstance(value, str) and key in REDACTED_FIELDS:
+        return re.sub(r"\S", "x", value)
+    return value
+
+
+class RequestRecorder:
+    """Append sampled request/response pairs to a JSONL file.
+
+    Each line holds the arrival ``timestamp``, the ``endpoint``, the
+    ``request`` and ``response`` bodies and the handling ``latency_ms``,
+    which is what ``server.replay`` reads back.
+
+    Records are handed to a background thread that redacts, serializes and
+    writes them, so recording never blocks the event loop. If the writer
+    falls more than ``max_pending`` records behind, new records are dropped.
+
+    Args:
+        path: File to append records to.
+        sample_rate: Fraction of requests to record (0-1).
+        redact: Whether to mask message text before writing.
+        max_pending: Records queued for writing before new ones are dropped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 1.0,
+        redact: bool = True,
+        max_pending: int = 10000
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.redact = redact
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(max_pending)
+        self._writer = threading.Thread(
+            target=self._write_loop, name="request-recorder", daemon=True)
+        self._writer.start()
+
+    def record(
+        self,
+        endpoint: str,
+        request: Dict[str, Any],
+        response: Dict[str, Any],
+        started: float
+    ) -> None:
+        """Queue one handled request for writing if it is sampled.
+
+        Args:
+            endpoint: Path the request was sent to.
+            request: Request body.
+            response: Response body.
+            started: ``time.time()`` when the request arrived.
+        """
+        if random.random() >= self.sample_rate:
+            return
+
+        entry = {
+            "timestamp": started,
+            "endpoint": endpoint,
+            "request": request,
+            "response": response,
+            "latency_ms": (time.time() - started) * 1000
+        }
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        """Write queued records until ``close()`` sends the stop marker."""
+        file = None
+        try:
+            while True:
+                entry = self._queue.get()
+                if entry is None:
+                    return
+                if self.redact:
+                    entry = redact(entry)
+                try:
+                    if file is None:
+                        file = open(self.path, "a", encoding="utf-8")
+                    file.write(json.dumps(entry) + "\n")
+                    file.flush()
+                except OSError as e:
+                    # Recording is best-effort; never fail the server over it
+                    logger.warning("Could not write request record: %s", e)
+        finally:
+            if file is not None:
+                file.close()
+
+    def close(self) -> None:
+        """Write any pending records and close the file."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
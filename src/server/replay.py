@@ -0,0 +1,315 @@
+"""
+Replay recorded traffic against the server or the compiled graph.
+
+Reads the JSONL records written by ``RequestRecorder`` (enable with
+``SERVER_RECORD_PATH``) and replays them at their original pace, scaled by
+``--speed``.
+
+Usage:
+    python -m server.replay traffic.jsonl
+    python -m server.replay traffic.jsonl --speed 0 --profile cprofile
+    python -m server.replay traffic.jsonl --app --speed 0 --profile pyinstrument
+    python -m server.replay traffic.jsonl --target http://localhost:8000 --concurrency 8
+
+Without ``--target`` the requests are fed straight to the compiled graph.
+With ``--app`` they go through the FastAPI app in-process, so routing,
+validation and response serialization are included. ``--profile`` works
+with either: ``cprofile`` writes a pstats file (render with snakeviz or
+flameprof); ``pyinstrument`` writes a speedscope JSON flame graph and
+needs the ``profiling`` extra.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+import argparse
+import asyncio
+import http.client
+import json
+import statistics
+import threading
+import time
+
+from agentic_template.agent import create_agent, AgentState
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Load recorded requests, oldest first."""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda record: record["timestamp"])
+
+
+def state_from_record(record: Dict[str, Any]) -> AgentState:
+    """Build the initial agent state the server would build for a record."""
+    request = record["request"]
+    if record["endpoint"] == "/chat":
+        message = request["message"]
+    else:
+        user_messages = [
+            msg for msg in request["messages"] if msg["role"] == "user"]
+        message = user_messages[-1]["content"]
+    return {"messages": [message], "counter": 0}
+
+
+def graph_sender() -> Callable[[Dict[str, Any]], None]:
+    """Send records directly to the compiled graph."""
+    agent = create_agent()
+
+    def send(record: Dict[str, Any]) -> None:
+        agent.invoke(state_from_record(record))
+
+    return send
+
+
+@contextmanager
+def app_sender() -> Iterator[Callable[[Dict[str, Any]], None]]:
+    """Send records through the FastAPI app in-process.
+
+    Requests take the same routing, validation and serialization path as on
+    the server. While the sender is open, agent runs execute inline on the
+    calling thread instead of the server's thread pool, so a profiler on
+    that thread sees the whole request. Needs httpx (a dev dependency).
+    """
+    import httpx
+    from server import main as server_main
+
+    async def run_inline(func, *args):
+        return func(*args)
+
+    local = threading.local()
+    opened = []
+
+    def send(record: Dict[str, Any]) -> None:
+        if not hasattr(local, "client"):
+            local.loop = asyncio.new_event_loop()
+            local.client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=server_main.app),
+                base_url="http://replay"
+            )
+            opened.append((local.loop, local.client))
+        response = local.loop.run_until_complete(
+            local.client.post(record["endpoint"], json=record["request"]))
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+    original = server_main.run_in_threadpool
+    server_main.run_in_threadpool = run_inline
+    try:
+        yield send
+    finally:
+        server_main.run_in_threadpool = original
+        for loop, client in opened:
+            loop.run_until_complete(client.aclose())
+            loop.close()
+
+
+def http_sender(target: str) -> Callable[[Dict[str, Any]], None]:
+    """Send records to a running server, one keep-alive connection per thread.
+
+    Raises:
+        ValueError: If the target is not an http or https URL.
+    """
+    url = urlparse(target)
+    if url.scheme == "https":
+        connection_class, default_port = http.client.HTTPSConnection, 443
+    elif url.scheme == "http":
+        connection_class, default_port = http.client.HTTPConnection, 80
+    else:
+        raise ValueError(f"Unsupported target scheme: {url.scheme or target!r}")
+    local = threading.local()
+
+    def send(record: Dict[str, Any]) -> None:
+        path = url.path.rstrip("/") + record["endpoint"]
+        body = json.dumps(record["request"])
+        # A reused connection may have been closed by the server's or a
+        # gateway's keep-alive timeout; resend once on a fresh connection
+        for attempt in range(2):
+            connection = getattr(local, "connection", None)
+            if connection is None:
+                connection = connection_class(
+                    url.hostname, url.port or default_port)
+                local.connection = connection
+            try:
+                connection.request(
+                    "POST",
+                    path,
+                    body=body,
+                    headers={"Content-Type": "application/json"}
+                )
+                response = connection.getresponse()
+                response.read()
+                break
+            except (http.client.RemoteDisconnected,
+                    ConnectionResetError,
+                    BrokenPipeError):
+                connection.close()
+                local.connection = None
+                if attempt:
+                    raise
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status}")
+
+    return send
+
+
+def replay(
+    records: List[Dict[str, Any]],
+    send: Callable[[Dict[str, Any]], None],
+    speed: float = 1.0,
+    concurrency: int = 1
+) -> Dict[str, Any]:
+    """Replay records, keeping their original spacing divided by ``speed``.
+
+    Args:
+        records: Records sorted by timestamp.
+        send: Callable that issues one recorded request.
+        speed: Rate multiplier; 0 sends as fast as possible.
+        concurrency: Worker threads. With 1, requests run on the calling
+            thread so that profilers see them.
+
+    Returns:
+        Request count, error count, elapsed seconds, throughput and
+        latency percentiles in milliseconds.
+    """
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run(record: Dict[str, Any]) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            send(record)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    executor = ThreadPoolExecutor(concurrency) if concurrency > 1 else None
+    first = records[0]["timestamp"] if records else 0.0
+    began = time.perf_counter()
+
+    for record in records:
+        if speed > 0:
+            delay = (record["timestamp"] - first) / speed
+            wait = began + delay - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        if executor:
+            executor.submit(run, record)
+        else:
+            run(record)
+
+    if executor:
+        executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - began
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(records) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) if latencies else 0.0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99)
+        }
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Replay a recording from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("records", help="JSONL file written by the server recorder")
+    destination = parser.add_mutually_exclusive_group()
+    destination.add_argument(
+        "--target", help="Server base URL; omit to call the graph directly")
+    destination.add_argument(
+        "--app", action="store_true",
+        help="Send through the FastAPI app in-process instead of the bare graph")
+    parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="Rate multiplier; 0 replays as fast as possible (default: 1)")
+    parser.add_argument(
+        "--concurrency", type=int, default=1,
+        help="Worker threads (default: 1)")
+    parser.add_argument(
+        "--profile", choices=["cprofile", "pyinstrument"],
+        help="Profile the graph, or the app with --app, while replaying")
+    parser.add_argument(
+        "--profile-output",
+        help="Profile file (default: replay.prof or replay.speedscope.json)")
+    parser.add_argument(
+        "--profile-interval", type=float, default=0.001,
+        help="pyinstrument sampling interval in seconds (default: 0.001)")
+    args = parser.parse_args(argv)
+
+    if args.profile and args.target:
+        parser.error("--profile needs an in-process replay; use --app instead of --target")
+    if args.profile and args.concurrency > 1:
+        parser.error("--profile needs --concurrency 1 to see the replayed calls")
+
+    records = load_records(args.records)
+
+    with ExitStack() as stack:
+        if args.app:
+            try:
+                send = stack.enter_context(app_sender())
+            except ImportError:
+                parser.error("--app needs httpx; run: uv sync --dev")
+        elif args.target:
+            try:
+                send = http_sender(args.target)
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            send = graph_sender()
+
+        if args.profile == "cprofile":
+            import cProfile
+
+            output = args.profile_output or "replay.prof"
+            profiler = cProfile.Profile()
+            profiler.enable()
+            summary = replay(records, send, args.speed, args.concurrency)
+            profiler.disable()
+            profiler.dump_stats(output)
+        elif args.profile == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                from pyinstrument.renderers import SpeedscopeRenderer
+            except ImportError:
+                parser.error(
+                    "pyinstrument is not installed; run: uv sync --extra profiling")
+
+            output = args.profile_output or "replay.speedscope.json"
+            profiler = Profiler(interval=args.profile_interval)
+            profiler.start()
+            summary = replay(records, send, args.speed, args.concurrency)
+            profiler.stop()
+            # Keep short frames; the default renderer drops anything under 1%
+            renderer = SpeedscopeRenderer(processor_options={"filter_threshold": 0})
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(profiler.output(renderer))
+        else:
+            summary = replay(records, send, args.speed, args.concurrency)
+
+    print(json.dumps(summary, indent=2))
+    if args.profile:
+        print(f"Profile written to {output}")
+
+
+if __name__ == "__main__":
+    main()
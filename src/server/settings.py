@@ -0,0 +1,155 @@
+"""Transport, concurrency and recording settings for the FastAPI server."""
+
+from dataclasses import dataclass
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """Connection and response settings for serving the API.
+
+    Attributes:
+        host: Interface to bind to.
+        port: Port to listen on.
+        keep_alive: Seconds an idle keep-alive connection is held open.
+        backlog: Maximum number of pending connections in the listen queue.
+        http2: Serve with Hypercorn, which speaks HTTP/2 (h2c), instead of uvicorn.
+        gzip_min_size: Smallest response body, in bytes, that gets gzipped.
+            Set to 0 to disable compression.
+        gzip_level: zlib compression level (1-9).
+        concurrency_initial: Starting limit on concurrent agent runs.
+        concurrency_min: Lowest the adaptive limit may drop to.
+        concurrency_max: Highest the adaptive limit may grow to. Set equal
+            to ``concurrency_min`` for a fixed limit.
+        concurrency_queue_size: Requests allowed to wait for a slot when
+            the limit is reached. 0 rejects immediately.
+        concurrency_queue_timeout: Seconds a request waits for a slot
+            before it is rejected with 503.
+        record_path: JSONL file to record sampled requests to for replay.
+            Empty disables recording.
+        record_sample_rate: Fraction of requests to record (0-1).
+        record_redact: Mask message text in recorded requests.
+    """
+    host: str = "0.0.0.0"
+    port: int = 8000
+    keep_alive: int = 75
+    backlog: int = 2048
+    http2: bool = False
+    gzip_min_size: int = 1024
+    gzip_level: int = 6
+    concurrency_initial: int = 20
+    concurrency_min: int = 4
+    concurrency_max: int = 200
+    concurrency_queue_size: int = 100
+    concurrency_queue_timeout: float = 1.0
+    record_path: str = ""
+    record_sample_rate: float = 1.0
+    record_redact: bool = True
+
+    def __post_init__(self):
+        """Reject values that would only fail once requests arrive.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if not 1 <= self.gzip_level <= 9:
+            raise ValueError(
+                f"gzip_level must be between 1 and 9, got {self.gzip_level}")
+        if self.concurrency_min < 1:
+            raise ValueError(
+                f"concurrency_min must be at least 1, got {self.concurrency_min}")
+        if self.concurrency_min > self.concurrency_max:
+            raise ValueError(
+                f"concurrency_min ({self.concurrency_min}) must not exceed "
+                f"concurrency_max ({self.concurrency_max})")
+        if self.concurrency_queue_size < 0 or self.concurrency_queue_timeout < 0:
+            raise ValueError("concurrency queue size and timeout must not be negative")
+        if not 0.0 <= self.record_sample_rate <= 1.0:
+            raise ValueError(
+                "record_sample_rate must be between 0 and 1, "
+                f"got {self.record_sample_rate}")
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        """Build settings from ``SERVER_*`` environment variables."""
+        return cls(
+            host=os.environ.get("SERVER_HOST", cls.host),
+            port=_env_int("SERVER_PORT", cls.port),
+            keep_alive=_env_int("SERVER_KEEP_ALIVE", cls.keep_alive),
+            backlog=_env_int("SERVER_BACKLOG", cls.backlog),
+            http2=_env_bool("SERVER_HTTP2", cls.http2),
+            gzip_min_size=_env_int("SERVER_GZIP_MIN_SIZE", cls.gzip_min_size),
+            gzip_level=_env_int("SERVER_GZIP_LEVEL", cls.gzip_level),
+            concurrency_initial=_env_int(
+                "SERVER_CONCURRENCY_INITIAL", cls.concurrency_initial),
+            concurrency_min=_env_int("SERVER_CONCURRENCY_MIN", cls.concurrency_min),
+            concurrency_max=_env_int("SERVER_CONCURRENCY_MAX", cls.concurrency_max),
+            concurrency_queue_size=_env_int(
+                "SERVER_CONCURRENCY_QUEUE_SIZE", cls.concurrency_queue_size),
+            concurrency_queue_timeout=_env_float(
+                "SERVER_CONCURRENCY_QUEUE_TIMEOUT", cls.concurrency_queue_timeout),
+            record_path=os.environ.get("SERVER_RECORD_PATH", cls.record_path),
+            record_sample_rate=_env_float(
+                "SERVER_RECORD_SAMPLE_RATE", cls.record_sample_rate),
+            record_redact=_env_bool("SERVER_RECORD_REDACT", cls.record_redact),
+        )
+
+    def uvicorn_kwargs(self) -> dict:
+        """Keyword arguments for ``uvicorn.run``."""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "timeout_keep_alive": self.keep_alive,
+            "backlog": self.backlog,
+        }
+
+    def uvicorn_args(self) -> list[str]:
+        """Command-line arguments for ``python -m uvicorn``."""
+        return [
+            "--host", self.host,
+            "--port", str(self.port),
+            "--timeout-keep-alive", str(self.keep_alive),
+            "--backlog", str(self.backlog),
+        ]
+
+    def hypercorn_config(self):
+        """Build a Hypercorn ``Config``; requires the ``http2`` extra."""
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"{self.host}:{self.port}"]
+        config.keep_alive_timeout = self.keep_alive
+        config.backlog = self.backlog
+        return config
+
+    def hypercorn_args(self) -> list[str]:
+        """Command-line arguments for ``python -m hypercorn``."""
+        return [
+            "--bind", f"{self.host}:{self.port}",
+            "--keep-alive", str(self.keep_alive),
+            "--backlog", str(self.backlog),
+        ]
@@ -1,8 +1,15 @@
 """Unit tests for the LangGraph agent."""
 
+import gc
+import weakref
+
 import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
 from agentic_template.agent import (
     create_agent,
+    build_workflow,
+    clear_agent_cache,
     AgentState,
     process_message,
     should_continue
@@ -105,3 +112,55 @@ def test_agent_execution():
     # Verify the agent processed messages
     assert result["counter"] >= 1
     assert len(result["messages"]) >= 1
+
+
+def test_build_workflow():
+    """Test the graph structure is built and validated without compiling."""
+    workflow = build_workflow()
+
+    assert "process" in workflow.nodes
+
+
+def test_create_agent_is_cached():
+    """Test repeated calls with the same configuration share one graph."""
+    assert create_agent() is create_agent()
+    assert create_agent(interrupt_before=["process"]) is create_agent(
+        interrupt_before=("process",))
+
+
+def test_create_agent_cache_keyed_on_configuration():
+    """Test different configurations get different compiled graphs."""
+    checkpointer = InMemorySaver()
+
+    assert create_agent() is not create_agent(checkpointer)
+    assert create_agent(checkpointer) is create_agent(checkpointer)
+    assert create_agent() is not create_agent(debug=True)
+
+
+def test_create_agent_single_interrupt_node():
+    """Test a single node name is accepted for interrupts."""
+    agent = create_agent(interrupt_before="process")
+
+    assert agent is create_agent(interrupt_before=["process"])
+    assert agent is not create_agent(interrupt_before="*")
+
+
+def test_checkpointer_can_be_collected():
+    """Test a cached graph does not keep its checkpointer alive."""
+    checkpointer = InMemorySaver()
+    agent = create_agent(checkpointer)
+    checkpointer_ref = weakref.ref(checkpointer)
+
+    del agent, checkpointer
+    gc.collect()
+
+    assert checkpointer_ref() is None
+
+
+def test_clear_agent_cache():
+    """Test clearing the cache forces a fresh compile."""
+    agent = create_agent()
+
+    clear_agent_cache()
+
+    assert create_agent() is not agent
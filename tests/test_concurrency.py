@@ -0,0 +1,162 @@
+"""Unit tests for the adaptive concurrency limiter."""
+
+import asyncio
+
+import pytest
+
+from server.concurrency import GradientLimiter, LimitExceeded
+
+
+def test_try_acquire_up_to_limit():
+    """Test slots are handed out until the limit is reached."""
+    limiter = GradientLimiter(initial_limit=2, min_limit=1, max_limit=2)
+
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.in_flight == 2
+    assert limiter.rejected == 1
+
+
+def test_initial_limit_clamped_to_bounds():
+    """Test the starting limit respects the min and max limits."""
+    assert GradientLimiter(initial_limit=500, max_limit=200).limit == 200
+    assert GradientLimiter(initial_limit=20, min_limit=4, max_limit=4).limit == 4
+    assert GradientLimiter(initial_limit=1, min_limit=4).limit == 4
+
+
+def test_acquire_raises_when_limit_reached():
+    """Test the context manager raises once the limit is reached."""
+    limiter = GradientLimiter(initial_limit=1, min_limit=1, max_limit=1)
+
+    with limiter.acquire():
+        with pytest.raises(LimitExceeded):
+            with limiter.acquire():
+                pass
+
+    assert limiter.in_flight == 0
+
+
+def test_limit_grows_while_latency_is_steady():
+    """Test the limit increases when a saturated limiter sees flat latency."""
+    limiter = GradientLimiter(initial_limit=10, max_limit=100)
+
+    for _ in range(50):
+        while limiter.try_acquire():
+            pass
+        for _ in range(limiter.in_flight):
+            limiter.release(0.01)
+
+    assert limiter.limit > 10
+
+
+def test_limit_shrinks_when_latency_inflates():
+    """Test the limit decreases when latency jumps above the baseline."""
+    limiter = GradientLimiter(initial_limit=50, min_limit=4)
+
+    def saturate(latency):
+        while limiter.try_acquire():
+            pass
+        for _ in range(limiter.in_flight):
+            limiter.release(latency)
+
+    for _ in range(5):
+        saturate(0.01)
+    before = limiter.limit
+
+    for _ in range(3):
+        saturate(0.1)
+
+    assert limiter.limit < before
+    assert limiter.limit >= 4
+
+
+def test_limit_does_not_grow_when_underused():
+    """Test the limit stays put when traffic does not use it."""
+    limiter = GradientLimiter(initial_limit=20)
+
+    for _ in range(100):
+        limiter.try_acquire()
+        limiter.release(0.01)
+
+    assert limiter.limit == 20
+
+
+def test_acquire_async_waits_for_slot():
+    """Test a request over the limit gets the next freed slot."""
+    limiter = GradientLimiter(
+        initial_limit=1, min_limit=1, max_limit=1, max_waiting=1)
+
+    async def scenario():
+        order = []
+
+        async def holder():
+            async with limiter.acquire_async():
+                await asyncio.sleep(0.05)
+                order.append("holder")
+
+        async def waiter():
+            await asyncio.sleep(0.01)
+            async with limiter.acquire_async(timeout=1.0):
+                order.append("waiter")
+
+        await asyncio.gather(holder(), waiter())
+        return order
+
+    assert asyncio.run(scenario()) == ["holder", "waiter"]
+    assert limiter.in_flight == 0
+    assert limiter.rejected == 0
+
+
+def test_acquire_async_times_out():
+    """Test a waiting request is rejected when no slot frees up in time."""
+    limiter = GradientLimiter(
+        initial_limit=1, min_limit=1, max_limit=1, max_waiting=1)
+    limiter.try_acquire()
+
+    async def scenario():
+        async with limiter.acquire_async(timeout=0.01):
+            pass
+
+    with pytest.raises(LimitExceeded):
+        asyncio.run(scenario())
+    assert limiter.waiting == 0
+    assert limiter.rejected == 1
+
+
+def test_acquire_async_rejects_when_queue_full():
+    """Test requests beyond the wait queue are rejected immediately."""
+    limiter = GradientLimiter(
+        initial_limit=1, min_limit=1, max_limit=1, max_waiting=0)
+    limiter.try_acquire()
+
+    async def scenario():
+        async with limiter.acquire_async(timeout=1.0):
+            pass
+
+    with pytest.raises(LimitExceeded):
+        asyncio.run(scenario())
+    assert limiter.rejected == 1
+
+
+def test_acquire_async_cancelled_waiter_frees_its_slot():
+    """Test a cancelled waiter does not leak the slot handed to it."""
+    limiter = GradientLimiter(
+        initial_limit=1, min_limit=1, max_limit=1, max_waiting=1)
+    limiter.try_acquire()
+
+    async def scenario():
+        async def waiter():
+            async with limiter.acquire_async(timeout=1.0):
+                pass
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        limiter.release(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
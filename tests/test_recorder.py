@@ -0,0 +1,80 @@
+"""Unit tests for the request recorder."""
+
+import json
+
+from server.recorder import RequestRecorder, redact
+
+
+def test_redact_keeps_length_and_word_count():
+    """Test redaction masks text but keeps its shape."""
+    record = {
+        "endpoint": "/chat",
+        "request": {"message": "hello there"},
+        "response": {"response": "Processed: hello there", "counter": 1}
+    }
+
+    result = redact(record)
+
+    assert result["endpoint"] == "/chat"
+    assert result["request"]["message"] == "xxxxx xxxxx"
+    assert result["response"]["response"] == "xxxxxxxxxx xxxxx xxxxx"
+    assert result["response"]["counter"] == 1
+
+
+def test_redact_keeps_multiline_whitespace():
+    """Test redaction keeps newlines and tabs, and so the word count."""
+    text = "line one\nline two\tend"
+
+    result = redact({"content": text})["content"]
+
+    assert result == "xxxx xxx\nxxxx xxx\txxx"
+    assert len(result.split()) == len(text.split())
+
+
+def test_redact_nested_messages():
+    """Test redaction reaches message lists and keeps roles."""
+    request = {"messages": [{"role": "user", "content": "secret text"}]}
+
+    result = redact(request)
+
+    assert result["messages"][0] == {"role": "user", "content": "xxxxxx xxxx"}
+
+
+def test_record_writes_jsonl(tmp_path):
+    """Test records are appended as JSON lines."""
+    path = tmp_path / "records.jsonl"
+    recorder = RequestRecorder(str(path), redact=False)
+
+    recorder.record("/chat", {"message": "Hi"}, {"response": "Processed: Hi"}, 100.0)
+    recorder.record("/chat", {"message": "Yo"}, {"response": "Processed: Yo"}, 101.0)
+    recorder.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["timestamp"] == 100.0
+    assert lines[0]["endpoint"] == "/chat"
+    assert lines[1]["request"] == {"message": "Yo"}
+    assert "latency_ms" in lines[0]
+
+
+def test_record_sample_rate_zero(tmp_path):
+    """Test nothing is written when the sample rate is zero."""
+    path = tmp_path / "records.jsonl"
+    recorder = RequestRecorder(str(path), sample_rate=0.0)
+
+    recorder.record("/chat", {"message": "Hi"}, {"response": "Processed: Hi"}, 100.0)
+    recorder.close()
+
+    assert not path.exists()
+
+
+def test_record_drops_when_queue_full(tmp_path):
+    """Test records beyond the pending limit are dropped, not blocked on."""
+    recorder = RequestRecorder(str(tmp_path / "records.jsonl"), max_pending=1)
+    recorder._queue.put(None)
+
+    recorder.record("/chat", {"message": "Hi"}, {"response": "Processed: Hi"}, 100.0)
+    recorder.record("/chat", {"message": "Hi"}, {"response": "Processed: Hi"}, 100.0)
+    recorder._writer.join()
+
+    assert recorder.dropped >= 1
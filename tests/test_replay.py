@@ -0,0 +1,187 @@
+"""Unit tests for the traffic replay tool."""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import http.client
+import json
+import threading
+
+import pytest
+
+from server import main as server_main
+from server.replay import (
+    app_sender,
+    http_sender,
+    load_records,
+    main,
+    replay,
+    state_from_record
+)
+
+
+RECORDS = [
+    {
+        "timestamp": 101.0,
+        "endpoint": "/v1/chat/completions",
+        "request": {
+            "messages": [
+                {"role": "system", "content": "Be brief"},
+                {"role": "user", "content": "Second"}
+            ]
+        }
+    },
+    {
+        "timestamp": 100.0,
+        "endpoint": "/chat",
+        "request": {"message": "First"}
+    }
+]
+
+
+def write_records(path):
+    """Write the sample records to a JSONL file."""
+    path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n")
+
+
+def test_load_records_sorted(tmp_path):
+    """Test records are loaded in timestamp order."""
+    path = tmp_path / "records.jsonl"
+    write_records(path)
+
+    records = load_records(str(path))
+
+    assert [record["timestamp"] for record in records] == [100.0, 101.0]
+
+
+def test_state_from_record():
+    """Test records map to the state the server would build."""
+    assert state_from_record(RECORDS[1]) == {"messages": ["First"], "counter": 0}
+    assert state_from_record(RECORDS[0]) == {"messages": ["Second"], "counter": 0}
+
+
+def test_http_sender_uses_https(monkeypatch):
+    """Test https targets get a TLS connection on port 443 by default."""
+    opened = []
+
+    class FakeConnection:
+        def __init__(self, host, port):
+            opened.append((host, port))
+
+        def request(self, *args, **kwargs):
+            pass
+
+        def getresponse(self):
+            class Response:
+                status = 200
+
+                def read(self):
+                    return b"{}"
+            return Response()
+
+    monkeypatch.setattr(http.client, "HTTPSConnection", FakeConnection)
+
+    http_sender("https://gateway.example")(RECORDS[1])
+
+    assert opened == [("gateway.example", 443)]
+
+
+class DroppingHandler(BaseHTTPRequestHandler):
+    """Answer as if keep-alive were on, then close the connection anyway."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_sender_retries_dropped_keep_alive():
+    """Test a connection closed between records is reopened, not an error."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DroppingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        send = http_sender(f"http://127.0.0.1:{server.server_port}")
+        summary = replay([RECORDS[1]] * 3, send, speed=0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert summary["errors"] == 0
+
+
+def test_http_sender_rejects_other_schemes():
+    """Test targets that are not http or https are rejected."""
+    with pytest.raises(ValueError):
+        http_sender("ftp://gateway.example")
+
+
+def test_replay_counts_errors():
+    """Test replay reports requests, errors and latency percentiles."""
+    def send(record):
+        if record["endpoint"] == "/chat":
+            raise RuntimeError("boom")
+
+    summary = replay(RECORDS, send, speed=0)
+
+    assert summary["requests"] == 2
+    assert summary["errors"] == 1
+    assert summary["latency_ms"]["p50"] >= 0
+
+
+def test_main_profiles_graph(tmp_path, capsys):
+    """Test replaying against the graph with cProfile writes a profile."""
+    path = tmp_path / "records.jsonl"
+    output = tmp_path / "replay.prof"
+    write_records(path)
+
+    main([str(path), "--speed", "0", "--profile", "cprofile",
+          "--profile-output", str(output)])
+
+    summary = json.loads(capsys.readouterr().out.split("\nProfile")[0])
+    assert summary["requests"] == 2
+    assert summary["errors"] == 0
+    assert output.exists()
+
+
+def test_app_sender_goes_through_server():
+    """Test the in-process sender runs records through the FastAPI app."""
+    original = server_main.run_in_threadpool
+
+    with app_sender() as send:
+        summary = replay(RECORDS, send, speed=0)
+
+    assert summary["errors"] == 0
+    assert server_main.run_in_threadpool is original
+
+
+def test_main_profiles_app(tmp_path, capsys):
+    """Test profiling an --app replay covers the endpoint and the graph."""
+    import pstats
+
+    path = tmp_path / "records.jsonl"
+    output = tmp_path / "replay.prof"
+    write_records(path)
+
+    main([str(path), "--app", "--speed", "0", "--profile", "cprofile",
+          "--profile-output", str(output)])
+
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert {"chat", "chat_completions", "process_message"} <= functions
+
+
+def test_main_rejects_profile_with_target(tmp_path):
+    """Test profiling a remote server is refused."""
+    path = tmp_path / "records.jsonl"
+    write_records(path)
+
+    with pytest.raises(SystemExit):
+        main([str(path), "--target", "http://localhost:8000",
+              "--profile", "cprofile"])
@@ -1,9 +1,15 @@
 """Tests for the FastAPI server."""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
+from server import main
+from server.concurrency import GradientLimiter
+from server.recorder import RequestRecorder
 from server.main import app
+from server.settings import ServerSettings
 
 
 client = TestClient(app)
@@ -26,6 +32,36 @@ class TestServer:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["agent"] == "ready"
+        assert data["concurrency"]["limit"] > 0
+        assert data["concurrency"]["in_flight"] == 0
+
+    def test_metrics_endpoint(self):
+        """Test the metrics endpoint reports the concurrency limit."""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert "agent_concurrency_limit" in response.text
+        assert "agent_in_flight 0" in response.text
+
+    def test_thread_pool_sized_for_concurrency_limit(self):
+        """Test startup makes room in the thread pool for the max limit."""
+        from anyio import to_thread
+
+        with TestClient(app) as lifespan_client:
+            total = lifespan_client.portal.call(
+                lambda: to_thread.current_default_thread_limiter().total_tokens)
+
+        assert total >= main.settings.concurrency_max
+
+    def test_chat_endpoint_over_concurrency_limit(self, monkeypatch):
+        """Test requests over the concurrency limit are rejected with 503."""
+        limiter = GradientLimiter(initial_limit=1, min_limit=1, max_limit=1)
+        limiter.try_acquire()
+        monkeypatch.setattr(main, "limiter", limiter)
+
+        response = client.post("/chat", json={"message": "Hello"})
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
 
     def test_chat_endpoint_success(self):
         """Test the chat endpoint with a valid message."""
@@ -140,6 +176,109 @@ class TestServer:
         # Should return 400 for no user message
         assert response.status_code == 400
 
+    def test_large_response_is_gzipped(self):
+        """Test that large non-streaming bodies are gzip-compressed."""
+        test_request = {
+            "model": "agentic-template",
+            "messages": [
+                {"role": "user", "content": "word " * 1000}
+            ]
+        }
+
+        response = client.post(
+            "/v1/chat/completions",
+            json=test_request,
+            headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == "gzip"
+        assert response.json()["object"] == "chat.completion"
+
+    def test_small_response_is_not_gzipped(self):
+        """Test that bodies below the size threshold are sent uncompressed."""
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_requests_are_recorded(self, tmp_path, monkeypatch):
+        """Test handled requests are written by the recorder when enabled."""
+        path = tmp_path / "records.jsonl"
+        recorder = RequestRecorder(str(path))
+        monkeypatch.setattr(main, "recorder", recorder)
+
+        client.post("/chat", json={"message": "Hello"})
+        client.post("/v1/chat/completions", json={
+            "messages": [{"role": "user", "content": "Hi there"}]})
+        recorder.close()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["endpoint"] for r in records] == [
+            "/chat", "/v1/chat/completions"]
+        assert records[0]["request"] == {"message": "xxxxx"}
+
+
+class TestServerSettings:
+    """Test cases for the server transport settings."""
+
+    def test_defaults(self, monkeypatch):
+        """Test settings defaults when no environment is set."""
+        for name in ("SERVER_KEEP_ALIVE", "SERVER_HTTP2", "SERVER_GZIP_MIN_SIZE"):
+            monkeypatch.delenv(name, raising=False)
+
+        settings = ServerSettings.from_env()
+
+        assert settings.keep_alive == 75
+        assert settings.http2 is False
+        assert settings.gzip_min_size == 1024
+
+    def test_from_env(self, monkeypatch):
+        """Test settings are read from SERVER_* environment variables."""
+        monkeypatch.setenv("SERVER_PORT", "9000")
+        monkeypatch.setenv("SERVER_KEEP_ALIVE", "30")
+        monkeypatch.setenv("SERVER_BACKLOG", "4096")
+        monkeypatch.setenv("SERVER_HTTP2", "true")
+
+        settings = ServerSettings.from_env()
+
+        assert settings.port == 9000
+        assert settings.http2 is True
+        assert settings.uvicorn_kwargs()["timeout_keep_alive"] == 30
+        assert settings.uvicorn_kwargs()["backlog"] == 4096
+        assert "--keep-alive" in settings.hypercorn_args()
+
+
+    def test_empty_env_uses_defaults(self, monkeypatch):
+        """Test empty variables, as passed by docker-compose, keep defaults."""
+        monkeypatch.setenv("SERVER_KEEP_ALIVE", "")
+        monkeypatch.setenv("SERVER_RECORD_REDACT", "")
+
+        settings = ServerSettings.from_env()
+
+        assert settings.keep_alive == 75
+        assert settings.record_redact is True
+
+    @pytest.mark.parametrize("overrides", [
+        {"gzip_level": 0},
+        {"gzip_level": 10},
+        {"concurrency_min": 0},
+        {"concurrency_min": 50, "concurrency_max": 10},
+        {"record_sample_rate": -0.1},
+        {"record_sample_rate": 1.5},
+    ])
+    def test_out_of_range_settings_rejected(self, overrides):
+        """Test invalid settings fail at startup instead of per request."""
+        with pytest.raises(ValueError):
+            ServerSettings(**overrides)
+
+    def test_out_of_range_env_rejected(self, monkeypatch):
+        """Test invalid environment values are rejected by from_env."""
+        monkeypatch.setenv("SERVER_GZIP_LEVEL", "10")
+
+        with pytest.raises(ValueError):
+            ServerSettings.from_env()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])